@@ -1,8 +1,157 @@
-from typing import Dict, Type
-from dataclasses import asdict, dataclass
+from __future__ import annotations
 
+import os
+import sys
+from itertools import islice
+from math import nan
+from types import FunctionType, ModuleType
+from typing import (TYPE_CHECKING, Any, Callable, ClassVar, Dict, Iterable,
+                    List, Optional, Tuple, Type, TypeVar)
+from dataclasses import dataclass
 
-@dataclass()
+if TYPE_CHECKING:
+    import numpy as np
+
+_F = TypeVar('_F', bound=Callable[..., Any])
+
+# Numba подключается только явно: HOMEWORK_JIT=numba. По умолчанию формулы
+# считаются на обычных float, что лучше подходит для PyPy и коротких запусков.
+if os.environ.get('HOMEWORK_JIT') == 'numba':
+    from numba import njit as _numba_njit, prange
+    _HAS_NUMBA = True
+else:
+    _HAS_NUMBA = False
+    prange = range  # type: ignore[misc]
+
+
+def _numpy() -> ModuleType:
+    """Импортировать NumPy по требованию: скалярный путь без него."""
+    import numpy
+    return numpy
+
+
+def njit(*args: Any, **kwargs: Any) -> Callable[[_F], _F]:
+    """Скомпилировать функцию numba, если она включена.
+
+    Без HOMEWORK_JIT=numba, а также в собранном mypyc модуле (где функции
+    уже нативные), функции остаются как есть.
+    """
+    def decorator(func: _F) -> _F:
+        if not _HAS_NUMBA or not isinstance(func, FunctionType):
+            return func
+        return _numba_njit(*args, **kwargs)(func)
+    return decorator
+
+
+_LEN_STEP = 0.65
+_LEN_STROKE = 1.38
+_M_IN_KM = 1000
+_MINUTES_IN_HOUR = 60
+_RUN_COEF = 18
+_RUN_OFFSET = 20
+_WALK_A = 0.035
+_WALK_B = 0.029
+_SWM_OFF = 1.1
+_SWM_MUL = 2
+_WRITE_CHUNK = 4096
+
+
+@njit('f8(f8,f8,f8)', cache=True)
+def _run_cal(speed: float, duration: float, weight: float) -> float:
+    """Затраченные калории (бег)."""
+    return ((_RUN_COEF * speed - _RUN_OFFSET) * weight / _M_IN_KM
+            * duration * _MINUTES_IN_HOUR)
+
+
+@njit('f8(f8,f8,f8,f8)', cache=True)
+def _walk_cal(speed: float,
+              duration: float,
+              weight: float,
+              height: float
+              ) -> float:
+    """Затраченные калории (ходьба)."""
+    return ((_WALK_A * weight
+             + (speed * speed // height) * _WALK_B * weight)
+            * duration * _MINUTES_IN_HOUR)
+
+
+@njit('f8(f8,f8)', cache=True)
+def _swim_cal(speed: float, weight: float) -> float:
+    """Затраченные калории (плавание)."""
+    return (speed + _SWM_OFF) * _SWM_MUL * weight
+
+
+SWM_ID = 0
+RUN_ID = 1
+WLK_ID = 2
+
+
+def process_stream(type_ids: np.ndarray,
+                   action: np.ndarray,
+                   duration: np.ndarray,
+                   weight: np.ndarray,
+                   extra: np.ndarray
+                   ) -> np.ndarray:
+    """Затраченные калории для смешанного потока пакетов.
+
+    Вид тренировки задаётся кодом в type_ids (SWM_ID, RUN_ID, WLK_ID),
+    дополнительные параметры лежат в extra[i]: рост, длина бассейна и
+    количество бассейнов. Для неизвестного кода
+    результат равен nan. Массивы приводятся к int8 (type_ids) и float64
+    (остальные), поэтому принимаются любые числовые dtype в обоих режимах.
+    """
+    np = _numpy()
+    return _process_stream(
+        np.ascontiguousarray(type_ids, dtype=np.int8),
+        np.ascontiguousarray(action, dtype=np.float64),
+        np.ascontiguousarray(duration, dtype=np.float64),
+        np.ascontiguousarray(weight, dtype=np.float64),
+        np.ascontiguousarray(extra, dtype=np.float64),
+    )
+
+
+@njit('f8[:](i1[:],f8[:],f8[:],f8[:],f8[:,:])', parallel=True, cache=True)
+def _process_stream(type_ids: np.ndarray,
+                    action: np.ndarray,
+                    duration: np.ndarray,
+                    weight: np.ndarray,
+                    extra: np.ndarray
+                    ) -> np.ndarray:
+    """Ядро process_stream для массивов нужных dtype."""
+    n = type_ids.shape[0]
+    calories = duration.copy()
+    for i in prange(n):
+        if type_ids[i] == SWM_ID:
+            speed = (extra[i, 1] * extra[i, 2] / _M_IN_KM
+                     / duration[i])
+            calories[i] = _swim_cal(speed, weight[i])
+        elif type_ids[i] == RUN_ID:
+            speed = action[i] * _LEN_STEP / _M_IN_KM / duration[i]
+            calories[i] = _run_cal(speed, duration[i], weight[i])
+        elif type_ids[i] == WLK_ID:
+            speed = action[i] * _LEN_STEP / _M_IN_KM / duration[i]
+            calories[i] = _walk_cal(speed, duration[i], weight[i],
+                                    extra[i, 0])
+        else:
+            calories[i] = nan
+    return calories
+
+
+_TEMPLATE = ('Тип тренировки: {}; '
+             'Длительность: {:.3f} ч.; '
+             'Дистанция: {:.3f} км; '
+             'Ср. скорость: {:.3f} км/ч; '
+             'Потрачено ккал: {:.3f}.'
+             )
+
+
+# dataclass(slots=True) появился только в Python 3.10.
+_DATACLASS_SLOTS: Dict[str, bool] = (
+    {'slots': True} if sys.version_info >= (3, 10) else {}
+)
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class InfoMessage:
     """Информационное сообщение о тренировке."""
     training_type: str
@@ -10,23 +159,47 @@ class InfoMessage:
     distance: float
     speed: float
     calories: float
-    message = ('Тип тренировки: {training_type}; '
-               'Длительность: {duration:.3f} ч.; '
-               'Дистанция: {distance:.3f} км; '
-               'Ср. скорость: {speed:.3f} км/ч; '
-               'Потрачено ккал: {calories:.3f}.'
-               )
 
     def get_message(self) -> str:
         """Возвращает шаблон для вывода сообщения в терминал."""
-        return self.message.format(**asdict(self))
+        return _TEMPLATE.format(self.training_type, self.duration,
+                                self.distance, self.speed, self.calories)
+
+
+if sys.version_info < (3, 10):
+    def _add_slots(cls: type) -> type:
+        """Пересобирает dataclass со слотами, как dataclass(slots=True)."""
+        namespace = dict(vars(cls))
+        namespace['__slots__'] = tuple(cls.__dataclass_fields__)
+        namespace.pop('__dict__', None)
+        namespace.pop('__weakref__', None)
+        return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+    InfoMessage = _add_slots(InfoMessage)  # noqa: F811
+
+
+def _method_owner(cls: type, name: str) -> type:
+    """Класс из MRO, в котором определён метод name."""
+    for owner in cls.__mro__:
+        if name in vars(owner):
+            return owner
+    return object
 
 
 class Training:
     """Базовый класс тренировки."""
-    LEN_STEP = 0.65
-    M_IN_KM = 1000
-    MINUTES_IN_HOUR = 60
+    LEN_STEP: ClassVar[float] = _LEN_STEP
+    M_IN_KM: ClassVar[int] = _M_IN_KM
+    MINUTES_IN_HOUR: ClassVar[int] = _MINUTES_IN_HOUR
+    FIELDS: ClassVar[Tuple[str, ...]] = ('action', 'duration', 'weight')
+    FRAME_FORMAT: ClassVar[Tuple[Tuple[str, str], ...]] = (
+        ('action', '<i4'), ('duration', '<f4'), ('weight', '<f4')
+    )
+    _training_type: ClassVar[str] = 'Training'
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._training_type = cls.__name__
 
     def __init__(self,
                  action: int,
@@ -51,28 +224,110 @@ class Training:
 
     def show_training_info(self) -> InfoMessage:
         """Вернуть информационное сообщение о выполненной тренировке."""
+        distance, speed, calories = self._compute_all()
         return InfoMessage(
-            self.__class__.__name__,
+            self._training_type,
             self.duration,
-            self.get_distance(),
-            self.get_mean_speed(),
-            self.get_spent_calories()
+            distance,
+            speed,
+            calories
         )
 
+    def _compute_all(self) -> Tuple[float, float, float]:
+        """Получить дистанцию, среднюю скорость и калории за один проход.
+
+        Готовая скорость передаётся в _cal_from_speed, только если
+        get_mean_speed и get_spent_calories не переопределены ни в
+        экземпляре, ни в наследнике ниже класса с формулой калорий.
+        """
+        cls = type(self)
+        overrides = getattr(self, '__dict__', {})
+        distance = self.get_distance()
+        if ('get_mean_speed' in overrides
+                or cls.get_mean_speed is not Training.get_mean_speed):
+            speed = self.get_mean_speed()
+        else:
+            speed = distance / self.duration
+        if ('get_spent_calories' in overrides
+                or _method_owner(cls, 'get_spent_calories')
+                is not _method_owner(cls, '_cal_from_speed')):
+            calories = self.get_spent_calories()
+        else:
+            calories = self._cal_from_speed(speed)
+        return distance, speed, calories
+
+    def _cal_from_speed(self, speed: float) -> float:
+        """Получить калории по уже посчитанной средней скорости."""
+        return self.get_spent_calories()
+
+    @classmethod
+    def bulk_distance(cls, arrs: Dict[str, np.ndarray]) -> np.ndarray:
+        """Получить дистанцию в км для массива пакетов."""
+        distance = arrs['action'] * cls.LEN_STEP
+        distance /= cls.M_IN_KM
+        return distance
+
+    @classmethod
+    def bulk_mean_speed(cls,
+                        arrs: Dict[str, np.ndarray],
+                        distance: Optional[np.ndarray] = None
+                        ) -> np.ndarray:
+        """Получить среднюю скорость движения для массива пакетов."""
+        if distance is None:
+            distance = cls.bulk_distance(arrs)
+        return distance / arrs['duration']
+
+    @classmethod
+    def bulk_calories(cls,
+                      arrs: Dict[str, np.ndarray],
+                      speed: Optional[np.ndarray] = None
+                      ) -> np.ndarray:
+        """Получить количество затраченных калорий для массива пакетов."""
+        raise NotImplementedError
+
+    @classmethod
+    def _bulk_calories_buffer(cls,
+                              arrs: Dict[str, np.ndarray],
+                              speed: Optional[np.ndarray]
+                              ) -> np.ndarray:
+        """Получить массив скоростей, который можно менять на месте."""
+        if speed is None:
+            return cls.bulk_mean_speed(arrs)
+        return speed.copy()
+
 
 class Running(Training):
     """Тренировка: бег."""
+
     def get_spent_calories(self) -> float:
         """Получаем величину затраченных калорий (бег)"""
-        coeff_1 = 18
-        coeff_2 = 20
-        return ((coeff_1 * self.get_mean_speed() - coeff_2)
-                * self.weight / self.M_IN_KM
-                * self.duration * self.MINUTES_IN_HOUR)
+        return self._cal_from_speed(self.get_mean_speed())
+
+    def _cal_from_speed(self, speed: float) -> float:
+        """Калории бега по средней скорости"""
+        return _run_cal(speed, self.duration, self.weight)
+
+    @classmethod
+    def bulk_calories(cls,
+                      arrs: Dict[str, np.ndarray],
+                      speed: Optional[np.ndarray] = None
+                      ) -> np.ndarray:
+        """Получаем массив затраченных калорий (бег)"""
+        calories = cls._bulk_calories_buffer(arrs, speed)
+        calories *= _RUN_COEF
+        calories -= _RUN_OFFSET
+        calories *= arrs['weight']
+        calories /= _M_IN_KM
+        calories *= arrs['duration']
+        calories *= _MINUTES_IN_HOUR
+        return calories
 
 
 class SportsWalking(Training):
     """Тренировка: спортивная ходьба."""
+    FIELDS = Training.FIELDS + ('height',)
+    FRAME_FORMAT = Training.FRAME_FORMAT + (('height', '<f4'),)
+
     def __init__(self,
                  action: int,
                  duration: float,
@@ -84,18 +339,37 @@ class SportsWalking(Training):
 
     def get_spent_calories(self) -> float:
         """Получаем величину затраченных калорий (ходьба)"""
-        coeff_1 = 0.035
-        coeff_2 = 2
-        coeff_3 = 0.029
-        return ((coeff_1 * self.weight
-                 + (self.get_mean_speed() ** coeff_2
-                    // self.height) * coeff_3 * self.weight)
-                * self.duration * self.MINUTES_IN_HOUR)
+        return self._cal_from_speed(self.get_mean_speed())
+
+    def _cal_from_speed(self, speed: float) -> float:
+        """Калории ходьбы по средней скорости"""
+        return _walk_cal(speed, self.duration, self.weight, self.height)
+
+    @classmethod
+    def bulk_calories(cls,
+                      arrs: Dict[str, np.ndarray],
+                      speed: Optional[np.ndarray] = None
+                      ) -> np.ndarray:
+        """Получаем массив затраченных калорий (ходьба)"""
+        np = _numpy()
+        weight = arrs['weight']
+        calories = cls._bulk_calories_buffer(arrs, speed)
+        np.square(calories, out=calories)
+        np.floor_divide(calories, arrs['height'], out=calories)
+        calories *= _WALK_B
+        calories *= weight
+        calories += np.multiply(weight, _WALK_A)
+        calories *= arrs['duration']
+        calories *= _MINUTES_IN_HOUR
+        return calories
 
 
 class Swimming(Training):
     """Тренировка: плавание."""
-    LEN_STEP = 1.38
+    LEN_STEP: ClassVar[float] = _LEN_STROKE
+    FIELDS = Training.FIELDS + ('length_pool', 'count_pool')
+    FRAME_FORMAT = Training.FRAME_FORMAT + (('length_pool', '<f4'),
+                                            ('count_pool', '<u4'))
 
     def __init__(self,
                  action: int,
@@ -115,40 +389,194 @@ class Swimming(Training):
 
     def get_spent_calories(self) -> float:
         """Получаем величину затраченных калорий (плавание)"""
-        coeff_1 = 1.1   # Коээфицент каллорий 1
-        coeff_2 = 2     # Коээфицент каллорий 2
-        return ((self.get_mean_speed() + coeff_1) * coeff_2
-                * self.weight)
+        return self._cal_from_speed(self.get_mean_speed())
 
-    def get_distance(self) -> float:
-        """Получаем дистанцию плавания"""
-        return self.action * self.LEN_STEP / self.M_IN_KM
+    def _cal_from_speed(self, speed: float) -> float:
+        """Калории плавания по средней скорости"""
+        return _swim_cal(speed, self.weight)
 
+    @classmethod
+    def bulk_mean_speed(cls,
+                        arrs: Dict[str, np.ndarray],
+                        distance: Optional[np.ndarray] = None
+                        ) -> np.ndarray:
+        """Получаем массив средних скоростей для плавания"""
+        speed = arrs['length_pool'] * arrs['count_pool']
+        speed /= cls.M_IN_KM
+        speed /= arrs['duration']
+        return speed
 
-def read_package(workout_type: str, data: list) -> Training:
-    """Прочитать данные полученные от датчиков."""
-    dict_workout_type: Dict[str, Type[Training]] = {'SWM': Swimming,
-                                                    'RUN': Running,
-                                                    'WLK': SportsWalking
-                                                    }
-    try:
-        return dict_workout_type[workout_type](*data)
-    except KeyError:
+    @classmethod
+    def bulk_calories(cls,
+                      arrs: Dict[str, np.ndarray],
+                      speed: Optional[np.ndarray] = None
+                      ) -> np.ndarray:
+        """Получаем массив затраченных калорий (плавание)"""
+        calories = cls._bulk_calories_buffer(arrs, speed)
+        calories += _SWM_OFF
+        calories *= _SWM_MUL
+        calories *= arrs['weight']
+        return calories
+
+
+_WORKOUT_MAP: Dict[str, Type[Training]] = {'SWM': Swimming,
+                                           'RUN': Running,
+                                           'WLK': SportsWalking
+                                           }
+
+
+_FRAME_DTYPES: Dict[Type[Training], np.dtype] = {}
+
+
+def _get_training_class(workout_type: str) -> Type[Training]:
+    """Определить класс тренировки по её коду."""
+    training_class = _WORKOUT_MAP.get(workout_type)
+    if training_class is None:
         print(f'{workout_type} - Incorrect type of training. '
               f'Workout types supported - Swimming (SWM), '
               f'Running (RUN), SportsWalking (WLK).')
         exit()
+    return training_class
+
+
+def _frame_dtype(training_class: Type[Training]) -> np.dtype:
+    """Получить dtype бинарного кадра датчиков для класса тренировки."""
+    frame_dtype = _FRAME_DTYPES.get(training_class)
+    if frame_dtype is None:
+        frame_dtype = _numpy().dtype(list(training_class.FRAME_FORMAT))
+        _FRAME_DTYPES[training_class] = frame_dtype
+    return frame_dtype
+
+
+def read_package(workout_type: str, data: list) -> Training:
+    """Прочитать данные полученные от датчиков."""
+    training_class = _get_training_class(workout_type)
+    try:
+        return training_class(*data)
     except TypeError:
         print('Incorrect amount of data from sensors')
         exit()
 
 
+def read_packages(workout_type: str,
+                  data_matrix: np.ndarray
+                  ) -> Dict[str, np.ndarray]:
+    """Прочитать пачку однотипных пакетов в массивы по полям."""
+    np = _numpy()
+    fields = _get_training_class(workout_type).FIELDS
+    try:
+        matrix = np.asarray(data_matrix, dtype=np.float64)
+    except ValueError:
+        matrix = np.empty(0)
+    if matrix.ndim != 2 or matrix.shape[1] != len(fields):
+        print('Incorrect amount of data from sensors')
+        exit()
+    columns = np.ascontiguousarray(matrix.T)
+    return {field: columns[i] for i, field in enumerate(fields)}
+
+
+def read_packages_binary(workout_type: str,
+                         buf: bytes
+                         ) -> Dict[str, np.ndarray]:
+    """Прочитать пачку однотипных пакетов из бинарных кадров датчиков."""
+    np = _numpy()
+    training_class = _get_training_class(workout_type)
+    frame_dtype = _frame_dtype(training_class)
+    if len(buf) % frame_dtype.itemsize:
+        print('Incorrect amount of data from sensors')
+        exit()
+    frames = np.frombuffer(buf, dtype=frame_dtype)
+    return {field: frames[field].astype(np.float64)
+            for field in training_class.FIELDS}
+
+
+def _write_messages(messages: Iterable[str]) -> None:
+    """Вывести сообщения в терминал пачками по _WRITE_CHUNK строк."""
+    messages = iter(messages)
+    while True:
+        chunk = list(islice(messages, _WRITE_CHUNK))
+        if not chunk:
+            break
+        sys.stdout.write('\n'.join(chunk) + '\n')
+
+
 def main(training: Training) -> None:
     """Главная функция."""
     info: InfoMessage = training.show_training_info()
     print(InfoMessage.get_message(info))
 
 
+def main_all(trainings: Iterable[Training]) -> None:
+    """Главная функция для списка тренировок."""
+    _write_messages(training.show_training_info().get_message()
+                    for training in trainings)
+
+
+# Три одинаковые функции вместо одной: у каждой своя точка вызова
+# show_training_info, которая видит только один класс тренировки, и
+# специализирующий интерпретатор (PEP 659) может её закэшировать.
+def _message_swm(training: Training) -> str:
+    """Сообщение о тренировке (плавание)."""
+    return training.show_training_info().get_message()
+
+
+def _message_run(training: Training) -> str:
+    """Сообщение о тренировке (бег)."""
+    return training.show_training_info().get_message()
+
+
+def _message_wlk(training: Training) -> str:
+    """Сообщение о тренировке (ходьба)."""
+    return training.show_training_info().get_message()
+
+
+_MESSAGE_MAP: Dict[str, Callable[[Training], str]] = {'SWM': _message_swm,
+                                                      'RUN': _message_run,
+                                                      'WLK': _message_wlk
+                                                      }
+
+
+def main_packages(packages: Iterable[Tuple[str, list]]) -> None:
+    """Главная функция для потока пакетов от датчиков.
+
+    Перед сообщением об ошибке и exit() выводится уже накопленная пачка,
+    чтобы корректные результаты не терялись.
+    """
+    chunk: List[str] = []
+    for workout_type, data in packages:
+        training_class = _WORKOUT_MAP.get(workout_type)
+        try:
+            training = training_class(*data) if training_class else None
+        except TypeError:
+            training = None
+        if training is None:
+            _write_messages(chunk)
+            training = read_package(workout_type, data)
+        chunk.append(_MESSAGE_MAP[workout_type](training))
+        if len(chunk) == _WRITE_CHUNK:
+            _write_messages(chunk)
+            chunk.clear()
+    _write_messages(chunk)
+
+
+def main_batch(workout_type: str, data_matrix: np.ndarray) -> None:
+    """Главная функция для пачки однотипных пакетов."""
+    # Тип и размер пачки проверяются до вывода первого сообщения.
+    arrs = read_packages(workout_type, data_matrix)
+    training_class = _get_training_class(workout_type)
+    distances = training_class.bulk_distance(arrs)
+    speeds = training_class.bulk_mean_speed(arrs, distances)
+    calories = training_class.bulk_calories(arrs, speeds)
+    _write_messages(
+        InfoMessage(training_class._training_type,
+                    arrs['duration'][i],
+                    distances[i],
+                    speeds[i],
+                    calories[i]).get_message()
+        for i in range(len(calories))
+    )
+
+
 if __name__ == '__main__':
     packages = [
         ('SWM', [720, 1, 80, 25, 40]),
@@ -156,6 +584,4 @@ if __name__ == '__main__':
         ('WLK', [9000, 1, 75, 180]),
     ]
 
-    for workout_type, data in packages:
-        training = read_package(workout_type, data)
-        main(training)
+    main_packages(packages)
@@ -0,0 +1,8 @@
+from setuptools import setup
+from mypyc.build import mypycify
+
+setup(
+    name='homework',
+    py_modules=['homework'],
+    ext_modules=mypycify(['homework.py']),
+)
@@ -1,10 +1,17 @@
 import sys
+from importlib.util import module_from_spec, spec_from_file_location
 from pathlib import Path
 from io import StringIO
 
 BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
 sys.path.append(str(BASE_DIR))
 
+# Тестируем исходный homework.py, даже если рядом или в site-packages
+# лежит собранная mypyc версия модуля.
+_spec = spec_from_file_location('homework', BASE_DIR / 'homework.py')
+sys.modules['homework'] = module_from_spec(_spec)
+_spec.loader.exec_module(sys.modules['homework'])
+
 
 class Capturing(list):
     """
@@ -1,6 +1,11 @@
 import pytest
 import types
 import inspect
+import struct
+import os
+import subprocess
+import sys
+import numpy as np
 from conftest import Capturing
 
 try:
@@ -54,6 +59,16 @@ def test_InfoMessage():
         )
 
 
+def test_InfoMessage_slots():
+    info_message = homework.InfoMessage('Running', 1, 2, 3, 4)
+    assert not hasattr(info_message, '__dict__'), (
+        'Экземпляры `InfoMessage` должны хранить поля в слотах.'
+    )
+    assert info_message == homework.InfoMessage('Running', 1, 2, 3, 4), (
+        'Сообщения с одинаковыми полями должны быть равны.'
+    )
+
+
 @pytest.mark.parametrize('input_data, expected', [
     (['Swimming', 1, 75, 1, 80],
         'Тип тренировки: Swimming; '
@@ -384,3 +399,353 @@ def test_main_output(input_data, expected):
     assert get_message_output == expected, (
         'Метод `main` должен печатать результат в консоль.\n'
     )
+
+
+@pytest.mark.parametrize('workout_type, data_matrix, expected', [
+    ('SWM', [[720, 1, 80, 25, 40], [420, 4, 20, 42, 4]],
+        [336.0, 45.68000000000001]),
+    ('RUN', [[9000, 1, 75], [1206, 12, 6]],
+        [383.85, -81.32032799999999]),
+    ('WLK', [[9000, 1, 75, 180], [420, 4, 20, 42]],
+        [157.50000000000003, 168.00000000000003]),
+])
+def test_bulk_calories(workout_type, data_matrix, expected):
+    assert hasattr(homework, 'read_packages'), (
+        'Создайте функцию для обработки пачки пакетов - `read_packages`'
+    )
+    arrs = homework.read_packages(workout_type, data_matrix)
+    training_class = homework._WORKOUT_MAP[workout_type]
+    result = training_class.bulk_calories(arrs)
+    assert list(result) == expected, (
+        'Метод `bulk_calories` должен совпадать '
+        'с `get_spent_calories` для каждого пакета'
+    )
+
+
+def test_main_batch_output():
+    data_matrix = [[720, 1, 80, 25, 40], [720, 1, 80, 25, 40]]
+    with Capturing() as get_message_output:
+        homework.main_batch('SWM', data_matrix)
+    assert get_message_output == [
+        'Тип тренировки: Swimming; '
+        'Длительность: 1.000 ч.; '
+        'Дистанция: 0.994 км; '
+        'Ср. скорость: 1.000 км/ч; '
+        'Потрачено ккал: 336.000.'
+    ] * 2, (
+        'Функция `main_batch` должна печатать результат '
+        'для каждого пакета в консоль.\n'
+    )
+
+
+def test_process_stream():
+    assert hasattr(homework, 'process_stream'), (
+        'Создайте функцию для обработки смешанного потока '
+        'пакетов - `process_stream`'
+    )
+    type_ids = np.array(
+        [homework.SWM_ID, homework.RUN_ID, homework.WLK_ID, 7],
+        dtype=np.int8
+    )
+    action = np.array([720.0, 9000.0, 9000.0, 9000.0])
+    duration = np.array([1.0, 1.0, 1.0, 1.0])
+    weight = np.array([80.0, 75.0, 75.0, 75.0])
+    extra = np.array([
+        [0.0, 25.0, 40.0],
+        [0.0, 0.0, 0.0],
+        [180.0, 0.0, 0.0],
+        [180.0, 0.0, 0.0],
+    ])
+    result = homework.process_stream(type_ids, action, duration, weight, extra)
+    assert list(result[:3]) == [336.0, 383.85, 157.50000000000003], (
+        'Функция `process_stream` должна совпадать '
+        'с `get_spent_calories` для каждого пакета'
+    )
+    assert np.isnan(result[3]), (
+        'Функция `process_stream` должна возвращать nan '
+        'для неизвестного кода тренировки'
+    )
+
+
+def test_main_all_output():
+    assert hasattr(homework, 'main_all'), (
+        'Создайте функцию для вывода списка тренировок - `main_all`'
+    )
+    trainings = [
+        homework.read_package('SWM', [720, 1, 80, 25, 40]),
+        homework.read_package('RUN', [1206, 12, 6]),
+    ]
+    with Capturing() as get_message_output:
+        homework.main_all(trainings)
+    assert get_message_output == [
+        'Тип тренировки: Swimming; '
+        'Длительность: 1.000 ч.; '
+        'Дистанция: 0.994 км; '
+        'Ср. скорость: 1.000 км/ч; '
+        'Потрачено ккал: 336.000.',
+        'Тип тренировки: Running; '
+        'Длительность: 12.000 ч.; '
+        'Дистанция: 0.784 км; '
+        'Ср. скорость: 0.065 км/ч; '
+        'Потрачено ккал: -81.320.'
+    ], (
+        'Функция `main_all` должна печатать результат '
+        'для каждой тренировки в консоль.\n'
+    )
+
+
+@pytest.mark.parametrize('workout_type, frame_format, data, expected', [
+    ('SWM', '<ifffI', [720, 1, 80, 25, 40], 336.0),
+    ('RUN', '<iff', [9000, 1, 75], 383.85),
+    ('WLK', '<ifff', [9000, 1, 75, 180], 157.50000000000003),
+])
+def test_read_packages_binary(workout_type, frame_format, data, expected):
+    assert hasattr(homework, 'read_packages_binary'), (
+        'Создайте функцию для чтения бинарных кадров '
+        'датчиков - `read_packages_binary`'
+    )
+    buf = struct.pack(frame_format, *data) * 2
+    arrs = homework.read_packages_binary(workout_type, buf)
+    training_class = homework._WORKOUT_MAP[workout_type]
+    result = training_class.bulk_calories(arrs)
+    assert list(result) == [expected] * 2, (
+        'Функция `read_packages_binary` должна разбирать кадры '
+        'в массивы полей пакета'
+    )
+
+
+def test_main_packages_output():
+    packages = [
+        ('RUN', [1206, 12, 6]),
+        ('WLK', [9000, 1, 75, 180]),
+    ]
+    with Capturing() as get_message_output:
+        homework.main_packages(packages)
+    assert get_message_output == [
+        'Тип тренировки: Running; '
+        'Длительность: 12.000 ч.; '
+        'Дистанция: 0.784 км; '
+        'Ср. скорость: 0.065 км/ч; '
+        'Потрачено ккал: -81.320.',
+        'Тип тренировки: SportsWalking; '
+        'Длительность: 1.000 ч.; '
+        'Дистанция: 5.850 км; '
+        'Ср. скорость: 5.850 км/ч; '
+        'Потрачено ккал: 157.500.'
+    ], (
+        'Функция `main_packages` должна печатать результат '
+        'для каждого пакета в консоль.\n'
+    )
+
+
+def test_read_packages_ragged():
+    with Capturing() as get_message_output:
+        with pytest.raises(SystemExit):
+            homework.read_packages('SWM', [[720, 1, 80, 25, 40], [720, 1, 80]])
+    assert get_message_output == ['Incorrect amount of data from sensors'], (
+        'Функция `read_packages` должна сообщать о пакетах '
+        'с неверным количеством данных'
+    )
+
+
+@pytest.mark.parametrize('workout_type, data', [
+    ('RUN', [15000.7, 1, 75]),
+    ('WLK', [9000.7, 1, 75, 180]),
+    ('SWM', [720, 1, 80, 25, 40.5]),
+])
+def test_numba_matches_pure_python(workout_type, data):
+    pytest.importorskip('numba')
+    code = (
+        'import homework; '
+        f'print(homework.read_package({workout_type!r}, {data!r})'
+        '.get_spent_calories())'
+    )
+    results = []
+    for jit in ('', 'numba'):
+        env = dict(os.environ, HOMEWORK_JIT=jit)
+        results.append(subprocess.run(
+            [sys.executable, '-c', code], env=env, cwd=os.path.dirname(
+                homework.__file__), capture_output=True, text=True, check=True
+        ).stdout)
+    assert results[0] == results[1], (
+        'Расчёт калорий с HOMEWORK_JIT=numba должен совпадать '
+        'с расчётом на чистом Python'
+    )
+
+
+def test_training_type_of_subclass():
+    class TrailRunning(homework.Running):
+        pass
+
+    info = TrailRunning(9000, 1, 75).show_training_info()
+    assert info.training_type == 'TrailRunning', (
+        'Тип тренировки должен совпадать с именем класса, '
+        'в том числе для наследников'
+    )
+
+
+def test_main_packages_keeps_results_before_error():
+    packages = [
+        ('RUN', [15000, 1, 75]),
+        ('WLK', [9000, 1, 75, 180]),
+        ('XXX', [1, 2, 3]),
+    ]
+    with Capturing() as get_message_output:
+        with pytest.raises(SystemExit):
+            homework.main_packages(packages)
+    assert get_message_output == [
+        'Тип тренировки: Running; '
+        'Длительность: 1.000 ч.; '
+        'Дистанция: 9.750 км; '
+        'Ср. скорость: 9.750 км/ч; '
+        'Потрачено ккал: 699.750.',
+        'Тип тренировки: SportsWalking; '
+        'Длительность: 1.000 ч.; '
+        'Дистанция: 5.850 км; '
+        'Ср. скорость: 5.850 км/ч; '
+        'Потрачено ккал: 157.500.',
+        'XXX - Incorrect type of training. '
+        'Workout types supported - Swimming (SWM), '
+        'Running (RUN), SportsWalking (WLK).'
+    ], (
+        'Функция `main_packages` должна вывести результаты корректных '
+        'пакетов перед сообщением об ошибке.\n'
+    )
+
+
+def test_main_packages_keeps_results_before_bad_data():
+    packages = [
+        ('RUN', [15000, 1, 75]),
+        ('SWM', [720, 1, 80, 25]),
+    ]
+    with Capturing() as get_message_output:
+        with pytest.raises(SystemExit):
+            homework.main_packages(packages)
+    assert get_message_output == [
+        'Тип тренировки: Running; '
+        'Длительность: 1.000 ч.; '
+        'Дистанция: 9.750 км; '
+        'Ср. скорость: 9.750 км/ч; '
+        'Потрачено ккал: 699.750.',
+        'Incorrect amount of data from sensors'
+    ], (
+        'Функция `main_packages` должна вывести результаты корректных '
+        'пакетов перед сообщением о неверном количестве данных.\n'
+    )
+
+
+def test_show_training_info_uses_overrides():
+    class TreadmillRunning(homework.Running):
+        def get_distance(self):
+            return 10.0
+
+    info = TreadmillRunning(9000, 2, 75).show_training_info()
+    expected = TreadmillRunning(9000, 2, 75).get_spent_calories()
+    assert (info.distance, info.speed, info.calories) == (10.0, 5.0, expected), (
+        'Метод `show_training_info` должен учитывать переопределённые '
+        'в наследниках `get_distance` и `get_mean_speed`'
+    )
+
+
+@pytest.mark.parametrize('training_class, input_data', [
+    (homework.Running, [9000, 1, 75]),
+    (homework.SportsWalking, [9000, 1, 75, 180]),
+    (homework.Swimming, [720, 1, 80, 25, 40]),
+])
+def test_show_training_info_uses_calories_override(training_class,
+                                                   input_data):
+    class FixedCalories(training_class):
+        def get_spent_calories(self):
+            return 100.0
+
+    info = FixedCalories(*input_data).show_training_info()
+    assert info.calories == 100.0, (
+        'Метод `show_training_info` должен учитывать переопределённый '
+        'в наследнике `get_spent_calories`'
+    )
+
+    training = training_class(*input_data)
+    training.get_spent_calories = lambda: 200.0
+    training.get_mean_speed = lambda: 3.0
+    info = training.show_training_info()
+    assert (info.speed, info.calories) == (3.0, 200.0), (
+        'Метод `show_training_info` должен учитывать `get_mean_speed` и '
+        '`get_spent_calories`, переопределённые в экземпляре'
+    )
+
+
+def test_default_import_skips_numpy():
+    code = 'import sys, homework; print("numpy" in sys.modules)'
+    env = dict(os.environ, HOMEWORK_JIT='')
+    result = subprocess.run(
+        [sys.executable, '-c', code], env=env,
+        cwd=os.path.dirname(homework.__file__),
+        capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == 'False', (
+        'Без HOMEWORK_JIT=numba импорт `homework` не должен '
+        'загружать NumPy'
+    )
+
+
+@pytest.mark.parametrize('workout_type, data_matrix', [
+    ('SWM', [[720, 1, 80, 25, 40], [420, 4, 20, 42, 4]]),
+    ('RUN', [[9000, 1, 75], [1206, 12, 6]]),
+    ('WLK', [[9000, 1, 75, 180], [420, 4, 20, 42]]),
+])
+def test_bulk_calories_from_speed(workout_type, data_matrix):
+    arrs = homework.read_packages(workout_type, data_matrix)
+    training_class = homework._WORKOUT_MAP[workout_type]
+    distance = training_class.bulk_distance(arrs)
+    speed = training_class.bulk_mean_speed(arrs, distance)
+    expected_speed = speed.copy()
+    result = training_class.bulk_calories(arrs, speed)
+    assert list(result) == list(training_class.bulk_calories(arrs)), (
+        'Метод `bulk_calories` должен давать тот же результат '
+        'по уже посчитанной скорости'
+    )
+    assert list(speed) == list(expected_speed), (
+        'Метод `bulk_calories` не должен менять переданную скорость'
+    )
+
+
+@pytest.mark.parametrize('jit', ['', 'numba'])
+def test_process_stream_integer_input(jit):
+    if jit:
+        pytest.importorskip('numba')
+    code = (
+        'import numpy as np, homework; '
+        'print(homework.process_stream('
+        'np.array([1, 2], dtype=np.int64), '
+        'np.array([9000, 9000], dtype=np.int64), '
+        'np.array([1, 1], dtype=np.int64), '
+        'np.array([75, 75], dtype=np.int64), '
+        'np.array([[0.0, 0, 0], [180.0, 0, 0]])).tolist())'
+    )
+    env = dict(os.environ, HOMEWORK_JIT=jit)
+    result = subprocess.run(
+        [sys.executable, '-c', code], env=env,
+        cwd=os.path.dirname(homework.__file__),
+        capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == '[383.85, 157.50000000000003]', (
+        'Функция `process_stream` должна принимать целочисленные массивы '
+        'в обоих режимах'
+    )
+
+
+def test_SportsWalking_exact_multiple_of_height():
+    class SteadyWalking(homework.SportsWalking):
+        def get_mean_speed(self):
+            return 7.0
+
+    walking = SteadyWalking(9000, 1, 75, 49)
+    expected = (0.035 * 75 + (49.0 // 49) * 0.029 * 75) * 1 * 60
+    assert walking.get_spent_calories() == expected, (
+        'Квадрат скорости, кратный росту, должен делиться нацело '
+        'по правилам `//`'
+    )
+    assert walking.show_training_info().calories == expected, (
+        'Метод `show_training_info` должен считать калории ходьбы '
+        'по правилам `//`'
+    )